@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+
+""" A Python Service Manager """
+
+__author__ = "Konstantin Rolf"
+__copyright__ = "Copyright 2020, ALLTHEWAYAPP LTD"
+__credits__ = []
+
+__license__ = """ MIT """
+
+__version__ = "0.0.1"
+__maintainer__ = "Konstantin Rolf"
+__email__ = "konstantin.rolf@gmail.com"
+__status__ = "Prototype"
+
+from .servicemngr import Service, ServiceManager
+from .args import (AbstractValidator, PassValidator, ReplaceValidator,
+    AllValidator, AnyValidator, TypeValidator, ListValidator,
+    TupleValidator, ValueValidator, SwitchValidator, DictValidator)
+from .logger import (create_logger, addLoggerArguments,
+    createDefaultLogger, createLoggerFromArgs, enableAsyncLogging)
@@ -19,24 +19,169 @@ __status__ = "Prototype"
 from abc import ABC, abstractmethod
 from collections.abc import Sequence, Iterable
 
-class AbstractValidator(ABC): 
+# validator program opcodes #
+# compileProgram lowers a validator tree into a flat list of
+# (opcode, operand) instructions that runProgram executes with one
+# dispatch loop instead of a Python call per validator node.
+OP_PASS, OP_TYPE, OP_VALUE, OP_REPLACE, OP_ALL, OP_ANY, \
+    OP_SWITCH, OP_LIST, OP_TUPLE, OP_DICT = range(10)
+
+def runProgram(program, value):
+    """ Executes a validator program produced by compileProgram.
+
+    Instructions run in order against the current value; guard
+    instructions return None as soon as a test fails while container
+    instructions recurse into their sub-programs and replace the value
+    with the validated result. Returns the validated block iff every
+    instruction passed, None otherwise. """
+    for op, operand in program:
+        if op == OP_TYPE:
+            if not isinstance(value, operand):
+                return None
+        elif op == OP_VALUE:
+            if value != operand:
+                return None
+        elif op == OP_SWITCH:
+            table, default = operand
+            if type(value) is not tuple or len(value) != 2:
+                return None
+            sub = table.get(value[0], default)
+            if sub is None:
+                return None
+            result = runProgram(sub, value[1])
+            if result is None:
+                return None
+            value = (value[0], result)
+        elif op == OP_LIST:
+            sub, removeIfNone, anyIterable = operand
+            if type(value) is not list and type(value) is not tuple \
+                    and not (anyIterable and isinstance(value, Iterable)):
+                return None
+            if removeIfNone:
+                value = [result for v in value
+                    if (result := runProgram(sub, v)) is not None]
+            else:
+                value = [runProgram(sub, v) for v in value]
+        elif op == OP_TUPLE:
+            subs, allowEmpty, matchLength = operand
+            if type(value) is not tuple:
+                return None
+            if not subs:
+                if not allowEmpty:
+                    return None
+            elif matchLength and len(value) != len(subs):
+                return None
+            else:
+                value = tuple(runProgram(sub, v)
+                    for sub, v in zip(subs, value))
+        elif op == OP_DICT:
+            keySub, valueSub, tupleSub, removeIfNone = operand
+            if not isinstance(value, dict):
+                return None
+            if tupleSub is None:
+                value = {runProgram(keySub, k): runProgram(valueSub, v)
+                    for k, v in value.items()}
+            elif removeIfNone:
+                value = {k2: v2 for k, v in value.items()
+                    if (pair := runProgram(tupleSub,
+                        (runProgram(keySub, k), runProgram(valueSub, v)))) is not None
+                    for k2, v2 in (pair,)}
+            else:
+                value = dict(runProgram(tupleSub,
+                    (runProgram(keySub, k), runProgram(valueSub, v)))
+                    for k, v in value.items())
+        elif op == OP_ALL:
+            subs, allowEmpty, shortCircuit = operand
+            if not subs:
+                if not allowEmpty:
+                    return None
+            else:
+                checkResult = True
+                for sub in subs:
+                    checkResult = checkResult and (runProgram(sub, value) is not None)
+                    if shortCircuit and not checkResult:
+                        break
+                if not checkResult:
+                    return None
+        elif op == OP_ANY:
+            subs, allowEmpty, shortCircuit = operand
+            if not subs:
+                if not allowEmpty:
+                    return None
+            else:
+                result = None
+                for sub in subs:
+                    newResult = runProgram(sub, value)
+                    if newResult is not None:
+                        if shortCircuit:
+                            result = newResult
+                            break
+                        if result is not None:
+                            raise Exception('Multiple validators matched!')
+                        result = newResult
+                if result is None:
+                    return None
+                value = result
+        elif op == OP_REPLACE:
+            sub, replacement = operand
+            result = runProgram(sub, value)
+            value = result if result is not None else replacement
+        # OP_PASS keeps the value unchanged
+    return value
+
+class AbstractValidator(ABC):
     """ The general interface of any validator. Each subclass must
     implement the call method with a single parameter. It should
     return the validated block iff the validator test passed, None otherwise. """
 
+    __slots__ = ('info',)
+
     def __init__(self):
-        self.info = True
+        self.info = False
 
     @abstractmethod
     def _validate(self, value, level:int):
         pass
 
     def validate(self, value, level:int=0):
+        if not self.info:
+            return self._validate(value, level + 1)
+        return self.validate_traced(value, level)
+
+    def validate_traced(self, value, level:int=0):
+        """ Validates the value like validate but additionally prints a
+        trace line for this node. Opt-in debugging aid; the plain
+        validate call does not format or print anything. """
         result = self._validate(value, level + 1)
-        if self.info:
-            print('{}{} {} {}'.format(self.indent(level), result, value, self.name()))
+        print('{}{} {} {}'.format('  ' * level, result, value, self.name()))
         return result
 
+    def compile(self):
+        """ Compiles this validator tree into a single callable.
+
+        The returned callable takes a value and returns the validated
+        block iff the test passed, None otherwise. Subclasses override
+        this method to emit a closure that is specialized for their
+        subtree, avoiding the validate -> _validate dispatch and the
+        attribute lookups on every call. The default implementation
+        simply forwards to _validate. """
+        return lambda value, _validate=self._validate: _validate(value, 0)
+
+    def compileProgram(self):
+        """ Lowers this validator tree into a flat instruction program.
+
+        The program is a list of (opcode, operand) pairs executed by
+        runProgram with a single dispatch loop, removing the Python
+        call per validator node that even the compiled closures pay.
+        Nested containers reference sub-programs in their operand. """
+        program = []
+        self._emit(program)
+        return program
+
+    def _emit(self, program):
+        raise NotImplementedError(
+            '{} cannot be lowered to a program'.format(self.name()))
+
     def setInfo(self, value:bool):
         self.info = value
 
@@ -44,6 +189,8 @@ class AbstractValidator(ABC):
         return '  ' * level
 
 class PassValidator(AbstractValidator):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
@@ -51,6 +198,12 @@ class PassValidator(AbstractValidator):
         """ Passes any value """
         return value
 
+    def compile(self):
+        return lambda value: value
+
+    def _emit(self, program):
+        program.append((OP_PASS, None))
+
     def __str__(self):
         return 'PassValidator[]'
 
@@ -61,6 +214,8 @@ class ReplaceValidator(AbstractValidator):
     """ Validates the given input and replaces the input with a replacement
     value if the validator does not parse the value successful. """
 
+    __slots__ = ('validator', 'replacement')
+
     def __init__(self, validator, replacement):
         """ Creates a new ReplaceValidator.
         
@@ -79,6 +234,18 @@ class ReplaceValidator(AbstractValidator):
         result = self.validator.validate(value, level)
         return result if result is not None else self.replacement
 
+    def compile(self):
+        child = self.validator.compile()
+        replacement = self.replacement
+        def _compiled(value):
+            result = child(value)
+            return result if result is not None else replacement
+        return _compiled
+
+    def _emit(self, program):
+        program.append((OP_REPLACE,
+            (self.validator.compileProgram(), self.replacement)))
+
     def __str__(self) -> str:
         return 'ReplaceValidator[validator={} replacement={}]'.format(
             self.validator, self.replacement)
@@ -95,6 +262,8 @@ class AllValidator(AbstractValidator):
     """ Combines multiple validators in one class and returns the
     validated block iff all validators are successful, None otherwise. """
 
+    __slots__ = ('validators', 'shortCircuit', 'allowEmpty')
+
     def __init__(self, validators=[], shortCircuit:bool=False, allowEmpty:bool=False):
         """ Creates a new all validator with a list of subchecks
         
@@ -125,6 +294,27 @@ class AllValidator(AbstractValidator):
                 break
         return value if checkResult else None
 
+    def compile(self):
+        if not self.validators:
+            allowEmpty = self.allowEmpty
+            return lambda value: value if allowEmpty else None
+
+        children = [validator.compile() for validator in self.validators]
+        shortCircuit = self.shortCircuit
+        def _compiled(value):
+            checkResult = True
+            for child in children:
+                checkResult = checkResult and (child(value) is not None)
+                if shortCircuit and not checkResult:
+                    break
+            return value if checkResult else None
+        return _compiled
+
+    def _emit(self, program):
+        program.append((OP_ALL, (
+            [validator.compileProgram() for validator in self.validators],
+            self.allowEmpty, self.shortCircuit)))
+
     def __str__(self):
         return 'All[validators={}, circuit={}, allowEmpty={}]'.format(
             self.validators, self.shortCircuit, self.allowEmpty)
@@ -139,6 +329,8 @@ class AnyValidator(AbstractValidator):
     """ Combines multiple validators in one class and returns the
     validated block iff any validator was successful, None otherwise. """
 
+    __slots__ = ('validators', 'shortCircuit', 'allowEmpty')
+
     def __init__(self, validators=[], shortCircuit:bool=False, allowEmtpy:bool=False):
         """ Creates a new all validator with a list of subchecks
         
@@ -166,12 +358,60 @@ class AnyValidator(AbstractValidator):
         for validator in self.validators:
             newResult = validator.validate(value, level)
             if newResult is not None:
+                if self.shortCircuit:
+                    return newResult
                 if result is not None:
                     raise Exception('Multiple validators matched!')
                 result = newResult
-            if self.shortCircuit and not (result is not None):
-                break
-        return value if checkResult else None
+        return result
+
+    def compile(self):
+        if not self.validators:
+            allowEmpty = self.allowEmpty
+            return lambda value: value if allowEmpty else None
+
+        # An AnyValidator over two-element TupleValidators that start
+        # with a ValueValidator is a keyed dispatch: lower it to a
+        # SwitchValidator so the linear scan becomes one dict lookup.
+        if all(isinstance(validator, TupleValidator)
+                and len(validator.validators) == 2
+                and isinstance(validator.validators[0], ValueValidator)
+                for validator in self.validators):
+            return SwitchValidator({
+                validator.validators[0].value: validator.validators[1]
+                for validator in self.validators
+            }).compile()
+
+        children = [validator.compile() for validator in self.validators]
+        shortCircuit = self.shortCircuit
+        def _compiled(value):
+            result = None
+            for child in children:
+                newResult = child(value)
+                if newResult is not None:
+                    if shortCircuit:
+                        return newResult
+                    if result is not None:
+                        raise Exception('Multiple validators matched!')
+                    result = newResult
+            return result
+        return _compiled
+
+    def _emit(self, program):
+        # same keyed-dispatch lowering as compile()
+        if self.validators and all(isinstance(validator, TupleValidator)
+                and len(validator.validators) == 2
+                and isinstance(validator.validators[0], ValueValidator)
+                for validator in self.validators):
+            program.append((OP_SWITCH, ({
+                validator.validators[0].value:
+                    validator.validators[1].compileProgram()
+                for validator in self.validators
+            }, None)))
+            return
+        program.append((OP_ANY, (
+            [validator.compileProgram() for validator in self.validators],
+            self.allowEmpty, self.shortCircuit)))
 
     def __str__(self):
         return 'Any[validators={}, circuit={}, allowEmpty={}]'.format(
@@ -187,6 +427,8 @@ class AnyValidator(AbstractValidator):
 class TypeValidator(AbstractValidator):
     """ Validator that checks if a variable is of given type """
 
+    __slots__ = ('tp',)
+
     def __init__(self, tp):
         """ Creates a new type validator from a given type
         
@@ -202,6 +444,12 @@ class TypeValidator(AbstractValidator):
         """ Returns True iff value is of a given type, False otherwise """ 
         return value if isinstance(value, self.tp) else None
 
+    def compile(self):
+        return lambda value, tp=self.tp: value if isinstance(value, tp) else None
+
+    def _emit(self, program):
+        program.append((OP_TYPE, self.tp))
+
     def __str__(self):
         return 'Type[type={}]'.format(self.tp)
     
@@ -216,7 +464,9 @@ class ListValidator(AbstractValidator):
     """ Creates a checker that checks if a variable is a of a given type
     and if all children (when iterated) satisfy a a another checker. """
 
-    def __init__(self, validator, removeIfNone:bool=True):
+    __slots__ = ('validator', 'removeIfNone', 'anyIterable')
+
+    def __init__(self, validator, removeIfNone:bool=True, anyIterable:bool=False):
         """ Creates a new list validator
 
         Parameters
@@ -226,17 +476,58 @@ class ListValidator(AbstractValidator):
         removeIfNone : bool
             Whether to remove all values that are None from the list.
             The default value is True.
+        anyIterable : bool
+            Whether the compiled form accepts arbitrary iterables. The
+            Iterable instance check is comparatively expensive, so by
+            default the compiled form only accepts real lists and
+            tuples, which is all the config schema ever feeds it
+            (default is False).
         """
         super().__init__()
         self.validator = validator
         self.removeIfNone = removeIfNone
+        self.anyIterable = anyIterable
 
     def _validate(self, value, level:int):
         if not isinstance(value, Iterable):
             return None
         newValues = (self.validator.validate(val, level) for val in value)
         return ([val for val in newValues if val is not None]
-            if self.removeIfNone else [newValues])
+            if self.removeIfNone else list(newValues))
+
+    def compile(self):
+        # The guards are inlined into each closure: exact type checks
+        # are ~5x cheaper than the Iterable subclass hook lookup, and
+        # the single-pass walrus comprehension keeps the child result
+        # in a local instead of chaining generators.
+        child = self.validator.compile()
+        if self.anyIterable:
+            if self.removeIfNone:
+                def _compiled(value):
+                    if not isinstance(value, Iterable):
+                        return None
+                    return [result for v in value if (result := child(v)) is not None]
+            else:
+                def _compiled(value):
+                    if not isinstance(value, Iterable):
+                        return None
+                    return [child(v) for v in value]
+        else:
+            if self.removeIfNone:
+                def _compiled(value):
+                    if type(value) is not list and type(value) is not tuple:
+                        return None
+                    return [result for v in value if (result := child(v)) is not None]
+            else:
+                def _compiled(value):
+                    if type(value) is not list and type(value) is not tuple:
+                        return None
+                    return [child(v) for v in value]
+        return _compiled
+
+    def _emit(self, program):
+        program.append((OP_LIST, (self.validator.compileProgram(),
+            self.removeIfNone, self.anyIterable)))
 
     def __str__(self):
         return 'List[validator={}, removeIfNone={}]'.format(
@@ -249,6 +540,8 @@ class ListValidator(AbstractValidator):
         return 'ListValidator'
 
 class TupleValidator(AbstractValidator):
+    __slots__ = ('matchLength', 'allowEmpty', 'shortCircuit', 'validators')
+
     def __init__(self, validators, allowEmpty:bool=True, shortCircuit:bool=True, matchLength:bool=True):
         super().__init__()
         self.matchLength = matchLength
@@ -270,6 +563,49 @@ class TupleValidator(AbstractValidator):
             zip(self.validators, value))
         return result
 
+    def compile(self):
+        if not self.validators:
+            allowEmpty = self.allowEmpty
+            return lambda value: (value if allowEmpty else None) \
+                if type(value) is tuple else None
+
+        children = [validator.compile() for validator in self.validators]
+        # The config schemas only ever build narrow tuples, so emit a
+        # hand-unrolled closure for the common widths. The unrolled
+        # forms avoid the zip/generator machinery per call; type(value)
+        # is exact since tuples are built by DictValidator itself.
+        if self.matchLength:
+            if len(children) == 1:
+                a, = children
+                return lambda v: (a(v[0]),) \
+                    if type(v) is tuple and len(v) == 1 else None
+            if len(children) == 2:
+                a, b = children
+                return lambda v: (a(v[0]), b(v[1])) \
+                    if type(v) is tuple and len(v) == 2 else None
+            if len(children) == 3:
+                a, b, c = children
+                return lambda v: (a(v[0]), b(v[1]), c(v[2])) \
+                    if type(v) is tuple and len(v) == 3 else None
+            if len(children) == 4:
+                a, b, c, d = children
+                return lambda v: (a(v[0]), b(v[1]), c(v[2]), d(v[3])) \
+                    if type(v) is tuple and len(v) == 4 else None
+
+        matchLength = self.matchLength
+        def _compiled(value):
+            if type(value) is not tuple:
+                return None
+            if matchLength and len(value) != len(children):
+                return None
+            return tuple(child(v) for child, v in zip(children, value))
+        return _compiled
+
+    def _emit(self, program):
+        program.append((OP_TUPLE, (
+            [validator.compileProgram() for validator in self.validators],
+            self.allowEmpty, self.matchLength)))
+
     def __str__(self):
         return 'Tuple[validators={}, circuit={}, allowEmpty={}, matchLength={}]'.format(
             self.validators, self.shortCircuit, self.allowEmpty, self.matchLength)
@@ -282,6 +618,8 @@ class TupleValidator(AbstractValidator):
 
 
 class ValueValidator(AbstractValidator):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         super().__init__()
         self.value = value
@@ -289,6 +627,12 @@ class ValueValidator(AbstractValidator):
     def _validate(self, value, level:int):
         return value if value == self.value else None
 
+    def compile(self):
+        return lambda value, ref=self.value: value if value == ref else None
+
+    def _emit(self, program):
+        program.append((OP_VALUE, self.value))
+
     def __str__(self):
         return 'Value[value={}]'.format(self.value)
     
@@ -299,7 +643,75 @@ class ValueValidator(AbstractValidator):
         return 'ValueValidator'
 
 
+class SwitchValidator(AbstractValidator):
+    """ Validates a (key, value) tuple by dispatching the value to a
+    validator selected by the key through a single dict lookup. This is
+    equivalent to an AnyValidator over TupleValidators whose first
+    element is a ValueValidator, but runs in O(1) instead of scanning
+    every alternative. """
+
+    __slots__ = ('validators', 'default')
+
+    def __init__(self, validators, default=None):
+        """ Creates a new switch validator
+
+        Parameters
+        ----------
+        validators : dict
+            Maps each accepted key to the validator that is applied to
+            the associated value.
+        default : AbstractValidator, optional
+            The validator applied to the value if the key is not found
+            in the dict. The tuple is rejected if no default is given
+            (default is None).
+        """
+        super().__init__()
+        self.validators = validators
+        self.default = default
+
+    def _validate(self, value, level:int):
+        if not isinstance(value, tuple) or len(value) != 2:
+            return None
+        validator = self.validators.get(value[0], self.default)
+        if validator is None:
+            return None
+        result = validator.validate(value[1], level)
+        return None if result is None else (value[0], result)
+
+    def compile(self):
+        table = {key: validator.compile()
+            for key, validator in self.validators.items()}
+        default = self.default.compile() if self.default is not None else None
+        def _compiled(value):
+            if not isinstance(value, tuple) or len(value) != 2:
+                return None
+            child = table.get(value[0], default)
+            if child is None:
+                return None
+            result = child(value[1])
+            return None if result is None else (value[0], result)
+        return _compiled
+
+    def _emit(self, program):
+        program.append((OP_SWITCH, ({
+            key: validator.compileProgram()
+            for key, validator in self.validators.items()
+        }, self.default.compileProgram() if self.default is not None else None)))
+
+    def __str__(self):
+        return 'Switch[validators={}, default={}]'.format(
+            self.validators, self.default)
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    def name(self):
+        return 'SwitchValidator'
+
+
 class DictValidator(AbstractValidator):
+    __slots__ = ('keyValidator', 'valueValidator', 'tupleValidator', 'removeIfNone')
+
     def __init__(self, keyValidator=None, valueValidator=None, tupleValidator=None, removeIfNone:bool=True):
         super().__init__()
         self.keyValidator = keyValidator if keyValidator is not None else PassValidator()
@@ -317,6 +729,45 @@ class DictValidator(AbstractValidator):
             tupleGenerator = (t for t in tupleGenerator if t is not None)
         return {k: v for k, v in tupleGenerator}
 
+    def compile(self):
+        keyChild = self.keyValidator.compile()
+        valueChild = self.valueValidator.compile()
+        if isinstance(self.tupleValidator, PassValidator):
+            # no tuple validator: the pair can never become None, so
+            # build the dict straight from the validated key and value
+            # without materializing an intermediate tuple
+            def _compiled(value):
+                if not isinstance(value, dict):
+                    return None
+                return {keyChild(k): valueChild(v) for k, v in value.items()}
+            return _compiled
+
+        tupleChild = self.tupleValidator.compile()
+        if self.removeIfNone:
+            # single fused comprehension: one pair tuple per entry and
+            # no generator chain, rejected pairs are filtered inline
+            def _compiled(value):
+                if not isinstance(value, dict):
+                    return None
+                return {k2: v2 for k, v in value.items()
+                    if (pair := tupleChild((keyChild(k), valueChild(v)))) is not None
+                    for k2, v2 in (pair,)}
+        else:
+            def _compiled(value):
+                if not isinstance(value, dict):
+                    return None
+                return dict(tupleChild((keyChild(k), valueChild(v)))
+                    for k, v in value.items())
+        return _compiled
+
+    def _emit(self, program):
+        program.append((OP_DICT, (
+            self.keyValidator.compileProgram(),
+            self.valueValidator.compileProgram(),
+            None if isinstance(self.tupleValidator, PassValidator)
+                else self.tupleValidator.compileProgram(),
+            self.removeIfNone)))
+
     def __str__(self):
         return 'Dict[keyValidator={}, valueValidator{}, tupleValidator={}, removeIfNone={}]'.format(
             self.keyValidator, self.valueValidator, self.tupleValidator, self.removeIfNone)
@@ -334,7 +785,8 @@ if __name__ == '__main__':
     def unitTest(inp, validator):
         print('Input:', inp)
         print('Validator:', validator)
-        result = validator(inp)
+        validator.setInfo(True)
+        result = validator.validate(inp)
         print('Result:', result)
 
     unitTest(
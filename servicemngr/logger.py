@@ -14,24 +14,36 @@ __email__ = "konstantin.rolf@gmail.com"
 __status__ = "Prototype"
 
 import sys, os
+import atexit
+import queue
 import logging
 import multiprocessing
 import traceback
 import argparse
 
+from logging.handlers import QueueHandler, QueueListener
+
 from datetime import datetime
 from pathlib import Path
 
-def create_logger(stdout:bool=True, logfile:str=None, name:str='LOG', logdir:str='logs', level:int=logging.DEBUG):
-    """ Creates a logger that is able to log messages between subprocesses.
-    
+# maps the log level names accepted on the command line to their
+# logging constants; built once at module scope
+_LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARN': logging.WARN,
+    'ERROR': logging.ERROR
+}
+
+def create_logger(stdout:bool=True, logfile:str=None, name:str='LOG', logdir:str='logs', level:int=logging.DEBUG, shared:bool=False):
+    """ Creates a logger, optionally able to log messages between subprocesses.
+
     Logs may be written simultaneously a log file in the log directory and stdout.
 
     Parameters
     ----------
     stdout : bool, optional
-        Whether the logger should send messages to the standard output stream. The output stream is a
-        shared resource. The logger used for this purpose is therefore the multiprocessing logger.
+        Whether the logger should send messages to the standard output stream.
         The default value for this argument is True.
     name : str, optional
         The logger's name (default is LOG).
@@ -42,6 +54,11 @@ def create_logger(stdout:bool=True, logfile:str=None, name:str='LOG', logdir:str
     logfile : str, optional
         The path where the shared log is stored. This place is placed below logDir. The default value
         for this argument is 'shared.log'.
+    shared : bool, optional
+        Whether the logger must be shareable between multiprocessing workers.
+        The multiprocessing logger funnels every record through a
+        cross-process lock, so it is only used on request; the default
+        per-process logger logs without that lock (default is False).
     Returns
     -------
         The created logger
@@ -57,7 +74,7 @@ def create_logger(stdout:bool=True, logfile:str=None, name:str='LOG', logdir:str
     if logdir is None:
         logdir = './'
 
-    logger = multiprocessing.get_logger()
+    logger = multiprocessing.get_logger() if shared else logging.getLogger(name)
     logger.setLevel(level)
     # this bit will make sure you won't have  duplicated messages in the output
     if not len(logger.handlers):
@@ -80,6 +97,39 @@ def create_logger(stdout:bool=True, logfile:str=None, name:str='LOG', logdir:str
 
     return logger
 
+def enableAsyncLogging(logger):
+    """ Moves the logger's handlers onto a background listener thread.
+
+    The logger's handlers are replaced by a single QueueHandler feeding
+    a QueueListener worker thread, so emitting a record only enqueues
+    it and the caller never blocks on stream or disk I/O. The listener
+    is stopped automatically at interpreter exit. Calling this on a
+    logger that is already asynchronous does nothing, so repeated
+    setup paths do not chain queues or leak listener threads.
+
+    Parameters
+    ----------
+    logger :
+        The logger whose handlers should run asynchronously.
+    Returns
+    -------
+        The started QueueListener, or None when the logger already
+        logs through a queue
+    """
+    # this bit will make sure repeated calls don't wrap the queue
+    # handler in yet another queue and listener thread
+    if len(logger.handlers) == 1 \
+            and isinstance(logger.handlers[0], QueueHandler):
+        return None
+    realHandlers = logger.handlers[:]
+    logQueue = queue.SimpleQueue()
+    logger.handlers = [QueueHandler(logQueue)]
+    listener = QueueListener(logQueue, *realHandlers,
+        respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
 def addLoggerArguments(parser, logfile:str, logname:str):
     # General log options
     parser.add_argument('--logdir', type=str, default='logs',
@@ -89,7 +139,7 @@ def addLoggerArguments(parser, logfile:str, logname:str):
     parser.add_argument('--logfile', type=str, default=logfile,
         help='Storage location for the server logfiles (default: {})'.format(logfile))
     parser.add_argument('--loglevel', type=str, default='DEBUG',
-        help='Log level (default: DEBUG)', choices=['DEBUG', 'INFO', 'WARN'])
+        help='Log level (default: DEBUG)', choices=list(_LEVELS))
     parser.add_argument('--logname', type=str, default=logname,
         help='The loggers name that is logged with every message.')
 
@@ -103,18 +153,12 @@ def createDefaultLogger(logfile:str, logname:str):
     )
 
 def createLoggerFromArgs(args):
-    levels = {
-        'DEBUG': logging.DEBUG,
-        'INFO': logging.INFO,
-        'WARN': logging.WARN
-    }
-
     # Creates the logfile defined by the args
     return create_logger(
-        stdout=args.stdout, # Uses stdout 
+        stdout=args.stdout, # Uses stdout
         logdir=args.logdir, # Argument directory
         logfile=args.logfile, # logfile
-        level=levels[args.loglevel], # loglevel
+        level=_LEVELS[args.loglevel], # loglevel
         name=args.logname
     )
 